@@ -17,7 +17,11 @@ class Config:
                 "test_url": "https://httpbin.org/ip",
                 "test_timeout": 5,
                 "max_proxies": 50,
-                "refresh_interval": 300
+                "refresh_interval": 300,
+                "test_on_refresh": True,
+                "cache_file": ".proxy_cache.json",
+                "failed_ttl": 21600,
+                "fastest_ratio": 0.8
             },
             "session": {
                 "max_sessions": 10
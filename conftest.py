@@ -0,0 +1,49 @@
+"""Общие фикстуры pytest для тестов системы прокси и сессий"""
+import copy
+
+import pytest
+from config import Config
+from proxy_manager import ProxyManager
+from session_manager import SessionManager
+
+
+def pytest_configure(config):
+    """Регистрация маркера network (запуск без сети: pytest -m "not network")"""
+    config.addinivalue_line(
+        'markers', 'network: тест обращается к источникам прокси и самим прокси через сеть'
+    )
+
+
+def _with_proxy_settings(config: Config, **settings) -> Config:
+    """Копия конфигурации с измененной секцией proxy; исходный объект и файл не меняются"""
+    result = copy.copy(config)
+    result.config = {**config.config, 'proxy': {**config.config['proxy'], **settings}}
+    return result
+
+
+@pytest.fixture(scope='session')
+def config() -> Config:
+    """Конфигурация: файл читается один раз на все тесты"""
+    return Config()
+
+
+@pytest.fixture
+def offline_config(config: Config) -> Config:
+    """Конфигурация без прокси: ProxyManager не обращается к сети"""
+    return _with_proxy_settings(config, enabled=False, cache_file='')
+
+
+@pytest.fixture(scope='session')
+def proxy_manager(config: Config, tmp_path_factory) -> ProxyManager:
+    """
+    ProxyManager: список прокси загружается из сети один раз на все тесты, кэш во временном каталоге.
+    Использующие его тесты помечаются network
+    """
+    cache_file = tmp_path_factory.mktemp('proxy_cache') / 'proxy_cache.json'
+    return ProxyManager(_with_proxy_settings(config, cache_file=str(cache_file)))
+
+
+@pytest.fixture(scope='session')
+def session_manager(config: Config) -> SessionManager:
+    """SessionManager, общий для всех тестов"""
+    return SessionManager(config)
@@ -5,6 +5,11 @@ import logging
 from typing import Dict, Any
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 class DataExporter:
@@ -49,8 +54,12 @@ class DataExporter:
         
         try:
             # Сохранение в JSON с красивым форматированием
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(profile_data, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(profile_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(profile_data, f, indent=2, ensure_ascii=False)
             
             logger.info(f"Профиль сохранен в {filepath}")
             return filepath
@@ -4,8 +4,10 @@ import re
 import json
 import logging
 import time
+import functools
 from typing import Dict, Any, Optional, List
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString
+from bs4.element import PreformattedString
 from urllib.parse import urlparse
 from config import Config
 from proxy_manager import ProxyManager
@@ -19,6 +21,29 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# Схемы, при которых URL профиля уже абсолютный
+_URL_PREFIXES = ('http://', 'https://')
+
+# Шаблоны периодов: "Jan 2020 – Mar 2022" (опыт, проекты) и "2016 – 2020" (образование)
+_RE_DURATION = re.compile(r'(\w+)\s+(\d{4})\s*[-–]\s*(\w+)?\s*(\d{4})?')
+_RE_PERIOD = re.compile(r'(\w+)?\s*(\d{4})\s*[-–]\s*(\w+)?\s*(\d{4})?')
+
+
+@functools.lru_cache(maxsize=256)
+def _ci(pattern: str) -> "re.Pattern":
+    """Скомпилированный регистронезависимый шаблон (кэшируется по тексту шаблона)"""
+    return re.compile(pattern, re.I)
+
+
+def _text(elem) -> str:
+    """Текст элемента, эквивалент get_text(strip=True) без обхода потомков для листовых элементов"""
+    string = elem.string
+    # Комментарии и прочие служебные строки get_text() пропускает, поэтому для них обычный путь
+    if isinstance(string, NavigableString) and not isinstance(string, PreformattedString):
+        return string.strip()
+    return elem.get_text(strip=True)
+
+
 # Попытаемся импортировать браузерный парсер
 try:
     from browser_parser import BrowserParser
@@ -30,6 +55,38 @@ except ImportError:
 class LinkedInParser:
     """Класс для парсинга профилей LinkedIn"""
     
+    # Альтернативные селекторы секций и их элементов: (тег, атрибуты)
+    SELECTORS = {
+        'experience': [('section', {'id': _ci(r'experience')}),
+                       ('div', {'class': _ci(r'experience|work-experience')})],
+        'experience_items': [('li', {'class': _ci(r'experience|position')}),
+                             ('div', {'class': _ci(r'position|experience-item|pv-entity')})],
+        'education': [('section', {'id': _ci(r'education')}),
+                      ('div', {'class': _ci(r'education')})],
+        'education_items': [('li', {'class': _ci(r'education|school')}),
+                            ('div', {'class': _ci(r'school|education-item|pv-entity')})],
+        'skills': [('section', {'id': _ci(r'skills')}),
+                   ('div', {'class': _ci(r'skills')})],
+        'skills_items': [('li', {'class': _ci(r'skill')}),
+                         ('span', {'class': _ci(r'skill')})],
+        'certifications': [('section', {'id': _ci(r'licenses|certifications')}),
+                           ('div', {'class': _ci(r'certification')})],
+        'certifications_items': [('li', {'class': _ci(r'certification')}),
+                                 ('div', {'class': _ci(r'certification')})],
+        'projects': [('section', {'id': _ci(r'projects')}),
+                     ('div', {'class': _ci(r'project')})],
+        'projects_items': [('li', {'class': _ci(r'project')}),
+                           ('div', {'class': _ci(r'project')})],
+        'volunteering': [('section', {'id': _ci(r'volunteering')}),
+                         ('div', {'class': _ci(r'volunteer')})],
+        'volunteering_items': [('li', {'class': _ci(r'volunteer')}),
+                               ('div', {'class': _ci(r'volunteer')})],
+        'languages': [('section', {'id': _ci(r'languages')}),
+                      ('div', {'class': _ci(r'language')})],
+        'languages_items': [('li', {'class': _ci(r'language')}),
+                            ('div', {'class': _ci(r'language')})],
+    }
+    
     def __init__(self, config: Config, proxy_manager: ProxyManager, rate_limiter: RateLimiter, session_manager: SessionManager = None, auth_manager: "AuthManager" = None):
         """
         Инициализация LinkedInParser
@@ -169,7 +226,7 @@ class LinkedInParser:
                             return None
                     
                     # Создаем новую сессию полностью
-                    self.session_manager.create_new_session_for_ip(proxy.replace('http://', '') if proxy else 'unknown')
+                    self.session_manager.create_new_session_for_ip(proxy['_key'][0] if proxy else 'unknown')
                     
                     if attempt < self.max_retries - 1:
                         wait_time = self.retry_delay * 2
@@ -275,6 +332,27 @@ class LinkedInParser:
         
         return None
     
+    def _select(self, root, key: str, find_all: bool = False):
+        """
+        Поиск по альтернативным селекторам из SELECTORS
+        
+        Селекторы проверяются в порядке приоритета (section, затем div; li, затем div),
+        поэтому результат зависит только от разбираемой страницы.
+        
+        Args:
+            root: Элемент, в котором выполняется поиск
+            key: Ключ в SELECTORS
+            find_all: Искать все совпадения вместо первого
+            
+        Returns:
+            Найденный элемент, список элементов или None
+        """
+        for name, attrs in self.SELECTORS[key]:
+            result = root.find_all(name, attrs) if find_all else root.find(name, attrs)
+            if result:
+                return result
+        return None
+    
     def _extract_public_identifier(self, url: str) -> Optional[str]:
         """Извлечение publicIdentifier из URL"""
         # Формат: https://www.linkedin.com/in/username
@@ -340,7 +418,7 @@ class LinkedInParser:
         # Извлечение из заголовка страницы
         title = soup.find('title')
         if title and not info['firstName']:
-            title_text = title.get_text(strip=True)
+            title_text = _text(title)
             # Формат: "Имя Фамилия | LinkedIn"
             if '|' in title_text:
                 name_part = title_text.split('|')[0].strip()
@@ -354,40 +432,40 @@ class LinkedInParser:
             info['headline'] = meta_data['og:description']
         else:
             # Поиск в HTML
-            headline_elem = soup.find('div', class_=re.compile(r'text-headline|pv-text-details__left-panel|top-card-layout__headline', re.I))
+            headline_elem = soup.find('div', class_=_ci(r'text-headline|pv-text-details__left-panel|top-card-layout__headline'))
             if not headline_elem:
-                headline_elem = soup.find('h2', class_=re.compile(r'headline|top-card-layout__headline', re.I))
+                headline_elem = soup.find('h2', class_=_ci(r'headline|top-card-layout__headline'))
             if not headline_elem:
                 headline_elem = soup.find('div', {'data-generated-suggestion-target': True})
             if headline_elem:
-                info['headline'] = headline_elem.get_text(strip=True)
+                info['headline'] = _text(headline_elem)
         
         # Извлечение фото из мета-тегов
         if 'og:image' in meta_data:
             info['photo'] = meta_data['og:image']
         else:
             # Поиск в HTML
-            photo_elem = soup.find('img', class_=re.compile(r'profile-photo|pv-profile-photo|top-card-profile-picture', re.I))
+            photo_elem = soup.find('img', class_=_ci(r'profile-photo|pv-profile-photo|top-card-profile-picture'))
             if not photo_elem:
-                photo_elem = soup.find('img', {'alt': re.compile(r'profile|photo', re.I)})
+                photo_elem = soup.find('img', {'alt': _ci(r'profile|photo')})
             if photo_elem:
                 photo_url = photo_elem.get('src') or photo_elem.get('data-delayed-url')
                 if photo_url:
                     info['photo'] = photo_url
         
         # Поиск локации
-        location_elem = soup.find('span', class_=re.compile(r'location|text-body-small|top-card__subline-item', re.I))
+        location_elem = soup.find('span', class_=_ci(r'location|text-body-small|top-card__subline-item'))
         if not location_elem:
-            location_elem = soup.find('div', class_=re.compile(r'location', re.I))
+            location_elem = soup.find('div', class_=_ci(r'location'))
         if location_elem:
-            location_text = location_elem.get_text(strip=True)
+            location_text = _text(location_elem)
             if location_text:
                 info['location'] = {'linkedinText': location_text}
         
         # Поиск секции "О себе"
-        about_section = soup.find('section', {'id': re.compile(r'about', re.I)})
+        about_section = soup.find('section', {'id': _ci(r'about')})
         if not about_section:
-            about_section = soup.find('div', class_=re.compile(r'about|summary', re.I))
+            about_section = soup.find('div', class_=_ci(r'about|summary'))
         if about_section:
             about_text = about_section.get_text(strip=True, separator='\n')
             # Удаляем лишние пробелы и переносы
@@ -435,15 +513,11 @@ class LinkedInParser:
         experience = []
         
         # Поиск секции опыта
-        experience_section = soup.find('section', {'id': re.compile(r'experience', re.I)})
-        if not experience_section:
-            experience_section = soup.find('div', class_=re.compile(r'experience|work-experience', re.I))
+        experience_section = self._select(soup, 'experience')
         
         if experience_section:
             # Поиск всех позиций - различные возможные селекторы
-            positions = experience_section.find_all('li', class_=re.compile(r'experience|position', re.I))
-            if not positions:
-                positions = experience_section.find_all('div', class_=re.compile(r'position|experience-item|pv-entity', re.I))
+            positions = self._select(experience_section, 'experience_items', find_all=True) or []
             
             for pos in positions:
                 exp_item = {
@@ -459,30 +533,30 @@ class LinkedInParser:
                 }
                 
                 # Извлечение должности
-                title_elem = pos.find('h3') or pos.find('h2') or pos.find('span', class_=re.compile(r'title|position', re.I))
+                title_elem = pos.find('h3') or pos.find('h2') or pos.find('span', class_=_ci(r'title|position'))
                 if not title_elem:
-                    title_elem = pos.find('div', class_=re.compile(r'title', re.I))
+                    title_elem = pos.find('div', class_=_ci(r'title'))
                 if title_elem:
-                    exp_item['position'] = title_elem.get_text(strip=True)
+                    exp_item['position'] = _text(title_elem)
                 
                 # Извлечение названия компании
-                company_elem = pos.find('span', class_=re.compile(r'company|organization', re.I))
+                company_elem = pos.find('span', class_=_ci(r'company|organization'))
                 if not company_elem:
-                    company_elem = pos.find('h4', class_=re.compile(r'company', re.I))
+                    company_elem = pos.find('h4', class_=_ci(r'company'))
                 if not company_elem:
-                    company_elem = pos.find('a', class_=re.compile(r'company', re.I))
+                    company_elem = pos.find('a', class_=_ci(r'company'))
                 if company_elem:
-                    exp_item['companyName'] = company_elem.get_text(strip=True)
+                    exp_item['companyName'] = _text(company_elem)
                 
                 # Извлечение периода работы
-                duration_elem = pos.find('span', class_=re.compile(r'duration|date-range|time', re.I))
+                duration_elem = pos.find('span', class_=_ci(r'duration|date-range|time'))
                 if not duration_elem:
-                    duration_elem = pos.find('h4', class_=re.compile(r'date', re.I))
+                    duration_elem = pos.find('h4', class_=_ci(r'date'))
                 if duration_elem:
-                    duration_text = duration_elem.get_text(strip=True)
+                    duration_text = _text(duration_elem)
                     exp_item['duration'] = duration_text
                     # Попытка парсинга дат
-                    date_match = re.search(r'(\w+)\s+(\d{4})\s*[-–]\s*(\w+)?\s*(\d{4})?', duration_text)
+                    date_match = _RE_DURATION.search(duration_text)
                     if date_match:
                         start_month, start_year = date_match.group(1), date_match.group(2)
                         end_month = date_match.group(3)
@@ -497,16 +571,16 @@ class LinkedInParser:
                             exp_item['endDate'] = {'text': 'Present'}
                 
                 # Извлечение описания
-                desc_elem = pos.find('div', class_=re.compile(r'description|summary', re.I))
+                desc_elem = pos.find('div', class_=_ci(r'description|summary'))
                 if desc_elem:
                     desc_text = desc_elem.get_text(strip=True, separator='\n')
                     desc_text = re.sub(r'\n\s*\n', '\n\n', desc_text).strip()
                     exp_item['description'] = desc_text
                 
                 # Извлечение локации
-                location_elem = pos.find('span', class_=re.compile(r'location', re.I))
+                location_elem = pos.find('span', class_=_ci(r'location'))
                 if location_elem:
-                    exp_item['location'] = location_elem.get_text(strip=True)
+                    exp_item['location'] = _text(location_elem)
                 
                 if exp_item['position'] or exp_item['companyName']:
                     experience.append(exp_item)
@@ -517,14 +591,10 @@ class LinkedInParser:
         """Извлечение образования"""
         education = []
         
-        education_section = soup.find('section', {'id': re.compile(r'education', re.I)})
-        if not education_section:
-            education_section = soup.find('div', class_=re.compile(r'education', re.I))
+        education_section = self._select(soup, 'education')
         
         if education_section:
-            schools = education_section.find_all('li', class_=re.compile(r'education|school', re.I))
-            if not schools:
-                schools = education_section.find_all('div', class_=re.compile(r'school|education-item|pv-entity', re.I))
+            schools = self._select(education_section, 'education_items', find_all=True) or []
             
             for school in schools:
                 edu_item = {
@@ -537,18 +607,18 @@ class LinkedInParser:
                 }
                 
                 # Название учебного заведения
-                school_name_elem = school.find('h3') or school.find('h2') or school.find('span', class_=re.compile(r'school|university', re.I))
+                school_name_elem = school.find('h3') or school.find('h2') or school.find('span', class_=_ci(r'school|university'))
                 if not school_name_elem:
-                    school_name_elem = school.find('a', class_=re.compile(r'school', re.I))
+                    school_name_elem = school.find('a', class_=_ci(r'school'))
                 if school_name_elem:
-                    edu_item['schoolName'] = school_name_elem.get_text(strip=True)
+                    edu_item['schoolName'] = _text(school_name_elem)
                 
                 # Степень
-                degree_elem = school.find('span', class_=re.compile(r'degree', re.I))
+                degree_elem = school.find('span', class_=_ci(r'degree'))
                 if not degree_elem:
-                    degree_elem = school.find('h4', class_=re.compile(r'degree', re.I))
+                    degree_elem = school.find('h4', class_=_ci(r'degree'))
                 if degree_elem:
-                    degree_text = degree_elem.get_text(strip=True)
+                    degree_text = _text(degree_elem)
                     # Разделяем степень и специальность
                     if ',' in degree_text:
                         parts = degree_text.split(',', 1)
@@ -558,12 +628,12 @@ class LinkedInParser:
                         edu_item['degree'] = degree_text
                 
                 # Период обучения
-                period_elem = school.find('span', class_=re.compile(r'date|period|time', re.I))
+                period_elem = school.find('span', class_=_ci(r'date|period|time'))
                 if period_elem:
-                    period_text = period_elem.get_text(strip=True)
+                    period_text = _text(period_elem)
                     edu_item['period'] = period_text
                     # Парсинг дат
-                    date_match = re.search(r'(\w+)?\s*(\d{4})\s*[-–]\s*(\w+)?\s*(\d{4})?', period_text)
+                    date_match = _RE_PERIOD.search(period_text)
                     if date_match:
                         start_month = date_match.group(1)
                         start_year = date_match.group(2)
@@ -590,19 +660,15 @@ class LinkedInParser:
         """Извлечение навыков"""
         skills = []
         
-        skills_section = soup.find('section', {'id': re.compile(r'skills', re.I)})
-        if not skills_section:
-            skills_section = soup.find('div', class_=re.compile(r'skills', re.I))
+        skills_section = self._select(soup, 'skills')
         
         if skills_section:
-            skill_items = skills_section.find_all('li', class_=re.compile(r'skill', re.I))
-            if not skill_items:
-                skill_items = skills_section.find_all('span', class_=re.compile(r'skill', re.I))
+            skill_items = self._select(skills_section, 'skills_items', find_all=True) or []
             
             for skill_item in skill_items:
                 skill_name_elem = skill_item.find('span') or skill_item.find('a')
                 if skill_name_elem:
-                    skill_name = skill_name_elem.get_text(strip=True)
+                    skill_name = _text(skill_name_elem)
                     if skill_name:
                         skills.append({'name': skill_name})
         
@@ -612,14 +678,10 @@ class LinkedInParser:
         """Извлечение сертификатов"""
         certifications = []
         
-        cert_section = soup.find('section', {'id': re.compile(r'licenses|certifications', re.I)})
-        if not cert_section:
-            cert_section = soup.find('div', class_=re.compile(r'certification', re.I))
+        cert_section = self._select(soup, 'certifications')
         
         if cert_section:
-            cert_items = cert_section.find_all('li', class_=re.compile(r'certification', re.I))
-            if not cert_items:
-                cert_items = cert_section.find_all('div', class_=re.compile(r'certification', re.I))
+            cert_items = self._select(cert_section, 'certifications_items', find_all=True) or []
             
             for cert_item in cert_items:
                 cert = {
@@ -629,17 +691,17 @@ class LinkedInParser:
                     'issuedByLink': None
                 }
                 
-                title_elem = cert_item.find('h3') or cert_item.find('span', class_=re.compile(r'title', re.I))
+                title_elem = cert_item.find('h3') or cert_item.find('span', class_=_ci(r'title'))
                 if title_elem:
-                    cert['title'] = title_elem.get_text(strip=True)
+                    cert['title'] = _text(title_elem)
                 
-                issuer_elem = cert_item.find('span', class_=re.compile(r'issuer|organization', re.I))
+                issuer_elem = cert_item.find('span', class_=_ci(r'issuer|organization'))
                 if issuer_elem:
-                    cert['issuedBy'] = issuer_elem.get_text(strip=True)
+                    cert['issuedBy'] = _text(issuer_elem)
                 
-                date_elem = cert_item.find('span', class_=re.compile(r'date', re.I))
+                date_elem = cert_item.find('span', class_=_ci(r'date'))
                 if date_elem:
-                    cert['issuedAt'] = date_elem.get_text(strip=True)
+                    cert['issuedAt'] = _text(date_elem)
                 
                 if cert['title']:
                     certifications.append(cert)
@@ -650,14 +712,10 @@ class LinkedInParser:
         """Извлечение проектов"""
         projects = []
         
-        projects_section = soup.find('section', {'id': re.compile(r'projects', re.I)})
-        if not projects_section:
-            projects_section = soup.find('div', class_=re.compile(r'project', re.I))
+        projects_section = self._select(soup, 'projects')
         
         if projects_section:
-            project_items = projects_section.find_all('li', class_=re.compile(r'project', re.I))
-            if not project_items:
-                project_items = projects_section.find_all('div', class_=re.compile(r'project', re.I))
+            project_items = self._select(projects_section, 'projects_items', find_all=True) or []
             
             for project_item in project_items:
                 project = {
@@ -668,20 +726,20 @@ class LinkedInParser:
                     'endDate': None
                 }
                 
-                title_elem = project_item.find('h3') or project_item.find('span', class_=re.compile(r'title', re.I))
+                title_elem = project_item.find('h3') or project_item.find('span', class_=_ci(r'title'))
                 if title_elem:
-                    project['title'] = title_elem.get_text(strip=True)
+                    project['title'] = _text(title_elem)
                 
-                desc_elem = project_item.find('div', class_=re.compile(r'description', re.I))
+                desc_elem = project_item.find('div', class_=_ci(r'description'))
                 if desc_elem:
-                    project['description'] = desc_elem.get_text(strip=True)
+                    project['description'] = _text(desc_elem)
                 
-                date_elem = project_item.find('span', class_=re.compile(r'date', re.I))
+                date_elem = project_item.find('span', class_=_ci(r'date'))
                 if date_elem:
-                    duration_text = date_elem.get_text(strip=True)
+                    duration_text = _text(date_elem)
                     project['duration'] = duration_text
                     # Парсинг дат
-                    date_match = re.search(r'(\w+)\s+(\d{4})\s*[-–]\s*(\w+)?\s*(\d{4})?', duration_text)
+                    date_match = _RE_DURATION.search(duration_text)
                     if date_match:
                         start_month, start_year = date_match.group(1), date_match.group(2)
                         end_month = date_match.group(3)
@@ -702,14 +760,10 @@ class LinkedInParser:
         """Извлечение волонтерства"""
         volunteering = []
         
-        vol_section = soup.find('section', {'id': re.compile(r'volunteering', re.I)})
-        if not vol_section:
-            vol_section = soup.find('div', class_=re.compile(r'volunteer', re.I))
+        vol_section = self._select(soup, 'volunteering')
         
         if vol_section:
-            vol_items = vol_section.find_all('li', class_=re.compile(r'volunteer', re.I))
-            if not vol_items:
-                vol_items = vol_section.find_all('div', class_=re.compile(r'volunteer', re.I))
+            vol_items = self._select(vol_section, 'volunteering_items', find_all=True) or []
             
             for vol_item in vol_items:
                 vol = {
@@ -722,17 +776,17 @@ class LinkedInParser:
                     'endDate': None
                 }
                 
-                role_elem = vol_item.find('h3') or vol_item.find('span', class_=re.compile(r'role', re.I))
+                role_elem = vol_item.find('h3') or vol_item.find('span', class_=_ci(r'role'))
                 if role_elem:
-                    vol['role'] = role_elem.get_text(strip=True)
+                    vol['role'] = _text(role_elem)
                 
-                org_elem = vol_item.find('span', class_=re.compile(r'organization', re.I))
+                org_elem = vol_item.find('span', class_=_ci(r'organization'))
                 if org_elem:
-                    vol['organizationName'] = org_elem.get_text(strip=True)
+                    vol['organizationName'] = _text(org_elem)
                 
-                date_elem = vol_item.find('span', class_=re.compile(r'date', re.I))
+                date_elem = vol_item.find('span', class_=_ci(r'date'))
                 if date_elem:
-                    vol['duration'] = date_elem.get_text(strip=True)
+                    vol['duration'] = _text(date_elem)
                 
                 if vol['role'] or vol['organizationName']:
                     volunteering.append(vol)
@@ -743,14 +797,10 @@ class LinkedInParser:
         """Извлечение языков"""
         languages = []
         
-        lang_section = soup.find('section', {'id': re.compile(r'languages', re.I)})
-        if not lang_section:
-            lang_section = soup.find('div', class_=re.compile(r'language', re.I))
+        lang_section = self._select(soup, 'languages')
         
         if lang_section:
-            lang_items = lang_section.find_all('li', class_=re.compile(r'language', re.I))
-            if not lang_items:
-                lang_items = lang_section.find_all('div', class_=re.compile(r'language', re.I))
+            lang_items = self._select(lang_section, 'languages_items', find_all=True) or []
             
             for lang_item in lang_items:
                 lang = {
@@ -758,13 +808,13 @@ class LinkedInParser:
                     'proficiency': None
                 }
                 
-                name_elem = lang_item.find('h3') or lang_item.find('span', class_=re.compile(r'name', re.I))
+                name_elem = lang_item.find('h3') or lang_item.find('span', class_=_ci(r'name'))
                 if name_elem:
-                    lang['name'] = name_elem.get_text(strip=True)
+                    lang['name'] = _text(name_elem)
                 
-                prof_elem = lang_item.find('span', class_=re.compile(r'proficiency', re.I))
+                prof_elem = lang_item.find('span', class_=_ci(r'proficiency'))
                 if prof_elem:
-                    lang['proficiency'] = prof_elem.get_text(strip=True)
+                    lang['proficiency'] = _text(prof_elem)
                 
                 if lang['name']:
                     languages.append(lang)
@@ -784,8 +834,8 @@ class LinkedInParser:
         logger.info(f"Начало парсинга профиля: {url}")
         
         # Нормализация URL
-        if not url.startswith('http'):
-            url = f"{self.base_url}/in/{url}" if not url.startswith('/') else f"{self.base_url}{url}"
+        if not url.startswith(_URL_PREFIXES):
+            url = f"{self.base_url}{url if url.startswith('/') else '/in/' + url}"
         
         # Загрузка страницы
         soup = self._fetch_page(url)
@@ -826,37 +876,33 @@ class LinkedInParser:
         volunteering = self._extract_volunteering(soup)
         languages = self._extract_languages(soup)
         
-        # Формирование структуры данных
+        public_identifier = basic_info.get('publicIdentifier')
+        profile_id = basic_info.get('id')
+        
+        # Формирование структуры данных: basic_info уже содержит все базовые поля
+        element = basic_info
+        element.update(
+            openToWork=False,
+            hiring=False,
+            premium=False,
+            influencer=False,
+            verified=False,
+            experience=experience,
+            education=education,
+            skills=skills,
+            certifications=certifications,
+            projects=projects,
+            volunteering=volunteering,
+            languages=languages,
+            connectionsCount=None,
+            followerCount=None,
+            currentPosition=[]
+        )
         profile_data = {
-            'element': {
-                'id': basic_info.get('id'),
-                'publicIdentifier': basic_info.get('publicIdentifier'),
-                'linkedinUrl': basic_info.get('linkedinUrl'),
-                'firstName': basic_info.get('firstName'),
-                'lastName': basic_info.get('lastName'),
-                'headline': basic_info.get('headline'),
-                'about': basic_info.get('about'),
-                'openToWork': False,
-                'hiring': False,
-                'photo': basic_info.get('photo'),
-                'premium': False,
-                'influencer': False,
-                'location': basic_info.get('location'),
-                'verified': False,
-                'experience': experience,
-                'education': education,
-                'skills': skills,
-                'certifications': certifications,
-                'projects': projects,
-                'volunteering': volunteering,
-                'languages': languages,
-                'connectionsCount': None,
-                'followerCount': None,
-                'currentPosition': []
-            },
+            'element': element,
             'query': {
-                'publicIdentifier': basic_info.get('publicIdentifier'),
-                'profileId': basic_info.get('id')
+                'publicIdentifier': public_identifier,
+                'profileId': profile_id
             },
             'status': 200,
             'retries': 0
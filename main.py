@@ -22,11 +22,8 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-def parse_single_profile(url: str, config: Config, proxy_manager: ProxyManager, 
-                         rate_limiter: RateLimiter, session_manager: SessionManager, exporter: DataExporter):
+def parse_single_profile(url: str, parser: LinkedInParser, exporter: DataExporter):
     """Парсинг одного профиля"""
-    parser = LinkedInParser(config, proxy_manager, rate_limiter, session_manager)
-    
     try:
         profile_data = parser.parse_profile(url)
         
@@ -43,8 +40,7 @@ def parse_single_profile(url: str, config: Config, proxy_manager: ProxyManager,
         logger.error(f"Критическая ошибка при парсинге {url}: {e}")
         return False
 
-def parse_from_file(filepath: str, config: Config, proxy_manager: ProxyManager,
-                    rate_limiter: RateLimiter, session_manager: SessionManager, exporter: DataExporter):
+def parse_from_file(filepath: str, parser: LinkedInParser, exporter: DataExporter):
     """Парсинг профилей из файла"""
     if not os.path.exists(filepath):
         logger.error(f"Файл {filepath} не найден")
@@ -58,7 +54,7 @@ def parse_from_file(filepath: str, config: Config, proxy_manager: ProxyManager,
     success_count = 0
     for i, url in enumerate(urls, 1):
         logger.info(f"Обработка {i}/{len(urls)}: {url}")
-        if parse_single_profile(url, config, proxy_manager, rate_limiter, session_manager, exporter):
+        if parse_single_profile(url, parser, exporter):
             success_count += 1
     
     logger.info(f"Обработано успешно: {success_count}/{len(urls)}")
@@ -106,16 +102,20 @@ def main():
     )
     session_manager = SessionManager(config)
     
-    # Обработка входных данных
-    if args.file:
-        parse_from_file(args.file, config, proxy_manager, rate_limiter, session_manager, exporter)
-    elif args.url:
-        parse_single_profile(args.url, config, proxy_manager, rate_limiter, session_manager, exporter)
-    else:
+    if not args.file and not args.url:
         parser.print_help()
         logger.error("Не указан URL профиля или файл со списком URL")
         sys.exit(1)
     
+    # Один парсер на весь запуск: BrowserParser и сессии создаются один раз
+    linkedin_parser = LinkedInParser(config, proxy_manager, rate_limiter, session_manager)
+    
+    # Обработка входных данных
+    if args.file:
+        parse_from_file(args.file, linkedin_parser, exporter)
+    else:
+        parse_single_profile(args.url, linkedin_parser, exporter)
+    
     # Вывод статистики
     logger.info("Статистика использования прокси:")
     proxy_manager.print_stats()
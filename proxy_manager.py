@@ -1,15 +1,80 @@
 """Модуль для управления прокси-серверами"""
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import logging
 import random
+import re
+import heapq
+import ipaddress
 import json
-from typing import Optional, List, Dict, Set
+import os
+import functools
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Optional, Iterable, List, Dict, Deque, Union, Tuple
 from config import Config
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Прокси в формате ip:port с проверкой диапазонов октетов (0-255) и порта (1-65535).
+# re.ASCII: \d должен совпадать только с цифрами 0-9, а не с любыми цифрами Unicode
+_OCTET = r'(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)'
+_PORT = r'(?:6553[0-5]|655[0-2]\d|65[0-4]\d\d|6[0-4]\d{3}|[1-5]\d{4}|[1-9]\d{0,3})'
+_PROXY = rf'{_OCTET}(?:\.{_OCTET}){{3}}:{_PORT}'
+_PROXY_RE = re.compile(_PROXY, re.ASCII)
+# Соседние ячейки HTML таблицы с IP и портом
+_HTML_CELLS_RE = re.compile(
+    r'<td[^>]*>\s*(\d{1,3}(?:\.\d{1,3}){3})\s*</td>\s*<td[^>]*>\s*(\d{1,5})\s*</td>',
+    re.IGNORECASE | re.ASCII
+)
+
+# Внутренний ключ прокси: (ip, port)
+ProxyKey = Tuple[str, int]
+
+
+def _proxy_key(proxy: str) -> ProxyKey:
+    """Преобразование строки ip:port в ключ (ip, port)"""
+    ip, port = proxy.split(':')
+    return ip, int(port)
+
+
+def _proxy_str(key: ProxyKey) -> str:
+    """Преобразование ключа (ip, port) в строку ip:port"""
+    return f"{key[0]}:{key[1]}"
+
+
+class ProxyStat:
+    """Статистика использования одного прокси (__slots__ вместо словаря на каждый прокси)"""
+    
+    __slots__ = ('requests', 'successful', 'failed', 'response_count',
+                 'avg_response_time', 'first_used', 'last_used')
+    
+    def __init__(self, first_used: float = 0.0):
+        self.requests = 0
+        self.successful = 0
+        self.failed = 0
+        self.response_count = 0
+        self.avg_response_time = 0.0
+        # Время хранится как epoch (time.time()) и форматируется только при выводе
+        self.first_used = first_used
+        self.last_used: Optional[float] = None
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Статистика в виде словаря (время в формате ISO)"""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        for name in ('first_used', 'last_used'):
+            data[name] = datetime.fromtimestamp(data[name]).isoformat() if data[name] else None
+        return data
+
+
 class ProxyManager:
     """Класс для управления прокси-серверами с поддержкой множественных источников"""
     
@@ -38,25 +103,114 @@ class ProxyManager:
             config: Объект конфигурации
         """
         self.config = config
-        self.proxies: List[str] = []
-        self.current_index = 0
-        self.failed_proxies: Set[str] = set()
+        self.proxies: List[ProxyKey] = []
+        # Очередь ротации только из рабочих прокси
+        self.healthy: Deque[ProxyKey] = deque()
+        # Неработающие прокси: ключ -> время отказа (epoch), хранятся failed_ttl секунд
+        self.failed_proxies: Dict[ProxyKey, float] = {}
+        # Самые быстрые рабочие прокси по среднему времени ответа
+        self.fastest: List[ProxyKey] = []
         self.last_refresh = 0
         self.proxy_enabled = config.get('proxy.enabled', True)
         self.test_url = config.get('proxy.test_url', 'https://httpbin.org/ip')
         self.test_timeout = config.get('proxy.test_timeout', 5)
         self.max_proxies = config.get('proxy.max_proxies', 50)
         self.refresh_interval = config.get('proxy.refresh_interval', 300)
+        self.test_on_refresh = config.get('proxy.test_on_refresh', True)
+        self.cache_file = config.get('proxy.cache_file', '.proxy_cache.json')
+        self.failed_ttl = config.get('proxy.failed_ttl', 6 * 3600)
+        # Доля запросов, отдаваемых самым быстрым прокси (остальные идут по кругу для замеров)
+        self.fastest_ratio = config.get('proxy.fastest_ratio', 0.8)
         
         # Статистика использования прокси
-        self.proxy_stats: Dict[str, Dict] = {}
+        self.proxy_stats: Dict[ProxyKey, ProxyStat] = {}
         self.total_requests = 0
         self.successful_requests = 0
         self.failed_requests = 0
         
-        if self.proxy_enabled:
+        # Сессия только для загрузки списков: keep-alive соединения с несколькими постоянными
+        # хостами источников переиспользуются между обновлениями. Трафик через прокси
+        # сюда не идет: проверки выполняются в отдельной короткоживущей сессии
+        self._source_session = requests.Session()
+        self._source_session.headers['Connection'] = 'keep-alive'
+        adapter = HTTPAdapter(pool_connections=len(self.PROXY_SOURCES))
+        self._source_session.mount('http://', adapter)
+        self._source_session.mount('https://', adapter)
+        
+        if self.proxy_enabled and not self._load_cache():
             self._fetch_proxies()
     
+    def _load_cache(self) -> bool:
+        """
+        Загрузка проверенных прокси из файлового кэша
+        
+        Returns:
+            True если в кэше есть свежий список прокси
+        """
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return False
+        
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            failed = cache.get('failed') or {}
+            if 'list' in failed:
+                # Старый формат кэша: один общий timestamp на весь список
+                failed = dict.fromkeys(failed['list'], failed.get('ts', 0))
+            failed_at = {_proxy_key(p): float(ts) for p, ts in failed.items()}
+            cached = cache.get('proxies') or {}
+            cached_list = [_proxy_key(p) for p in cached.get('list', [])]
+        except Exception as e:
+            logger.warning(f"Ошибка чтения кэша прокси: {e}")
+            return False
+        
+        # Неработающие прокси хранятся дольше, чем сам список; срок у каждого свой
+        self.failed_proxies.update(failed_at)
+        self._expire_failed()
+        
+        if time.time() - cached.get('ts', 0) >= self.refresh_interval:
+            return False
+        
+        self.proxies = [p for p in cached_list if p not in self.failed_proxies]
+        if not self.proxies:
+            return False
+        
+        self.healthy = deque(self.proxies)
+        self._update_ranking()
+        self.last_refresh = cached['ts']
+        logger.info(f"Загружено {len(self.proxies)} прокси из кэша {self.cache_file}")
+        return True
+    
+    def _save_cache(self):
+        """Сохранение списка прокси и неработающих прокси в файловый кэш"""
+        if not self.cache_file:
+            return
+        
+        # list() снимает копию за один шаг: прокси могут помечаться из других потоков
+        cache = {
+            'proxies': {'list': [_proxy_str(p) for p in list(self.proxies)], 'ts': self.last_refresh},
+            'failed': {_proxy_str(p): failed_at for p, failed_at in list(self.failed_proxies.items())}
+        }
+        # Пишем во временный файл и подменяем кэш целиком: читатель не увидит недописанный файл
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.cache_file)), suffix='.tmp'
+            )
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, self.cache_file)
+        except Exception as e:
+            logger.warning(f"Ошибка сохранения кэша прокси: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def _expire_failed(self):
+        """Забыть неработающие прокси, отказавшие больше failed_ttl секунд назад"""
+        cutoff = time.time() - self.failed_ttl
+        self.failed_proxies = {p: failed_at for p, failed_at in self.failed_proxies.items()
+                               if failed_at > cutoff}
+    
     def _fetch_proxies(self) -> bool:
         """
         Получение списка прокси из различных источников
@@ -66,36 +220,54 @@ class ProxyManager:
         """
         all_proxies = []
         
-        # Пробуем каждый источник
+        sources = []
         for source_name, source_config in self.PROXY_SOURCES.items():
             if not source_config.get('enabled', True):
                 logger.debug(f"Источник {source_name} отключен")
                 continue
-                
-            try:
-                logger.info(f"Получение прокси из источника {source_name}...")
-                proxies = self._fetch_from_source(source_name, source_config)
+            logger.info(f"Получение прокси из источника {source_name}...")
+            sources.append((source_name, source_config))
+        
+        # Опрашиваем источники параллельно: общее время равно времени самого медленного
+        with ThreadPoolExecutor(max_workers=max(len(sources), 1)) as executor:
+            futures = {
+                executor.submit(self._fetch_from_source, source_name, source_config): source_name
+                for source_name, source_config in sources
+            }
+            # Результаты обрабатываются по мере готовности, а не в порядке источников
+            for future in as_completed(futures):
+                source_name = futures[future]
+                try:
+                    proxies = future.result()
+                except Exception as e:
+                    logger.warning(f"Ошибка при получении прокси из {source_name}: {e}")
+                    continue
                 
                 if proxies:
                     logger.info(f"Получено {len(proxies)} прокси из {source_name}")
                     all_proxies.extend(proxies)
                 else:
                     logger.warning(f"Не удалось получить прокси из {source_name}")
-                    
-            except Exception as e:
-                logger.warning(f"Ошибка при получении прокси из {source_name}: {e}")
-                continue
         
-        # Удаляем дубликаты и неработающие прокси
-        unique_proxies = list(set(all_proxies))
+        # Удаляем дубликаты и неработающие прокси (с истекшим сроком снова допускаются)
+        self._expire_failed()
+        unique_proxies = list({_proxy_key(p) for p in all_proxies})
         unique_proxies = [p for p in unique_proxies if p not in self.failed_proxies]
         
         # Ограничиваем количество прокси
         self.proxies = unique_proxies[:self.max_proxies]
         
+        # Проверяем прокси один раз при обновлении, а не при каждом get_proxy
+        if self.test_on_refresh and self.proxies:
+            self._test_all_proxies()
+        
+        self.healthy = deque(self.proxies)
+        self._update_ranking()
+        
         if self.proxies:
             logger.info(f"Всего получено {len(self.proxies)} уникальных прокси")
             self.last_refresh = time.time()
+            self._save_cache()
             return True
         else:
             logger.warning("Не удалось получить рабочие прокси из всех источников")
@@ -116,78 +288,63 @@ class ProxyManager:
         parser = source_config.get('parser', 'lines')
         
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            if parser == 'lines':
-                return self._parse_proxies_lines(response.text)
-            elif parser == 'json_data':
-                return self._parse_proxies_json(response.text)
-            elif parser == 'html_table':
-                return self._parse_proxies_html(response.text)
-            else:
-                logger.warning(f"Неизвестный парсер: {parser}")
-                return []
+            # stream=True: построчные списки разбираются по мере загрузки, без буферизации всего ответа
+            with self._source_session.get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                
+                if parser == 'lines':
+                    response.encoding = response.encoding or 'utf-8'
+                    return self._parse_proxies_lines(response.iter_lines(decode_unicode=True))
+                elif parser == 'json_data':
+                    return self._parse_proxies_json(response.content)
+                elif parser == 'html_table':
+                    return self._parse_proxies_html(response.text)
+                else:
+                    logger.warning(f"Неизвестный парсер: {parser}")
+                    return []
                 
         except Exception as e:
             logger.error(f"Ошибка при загрузке прокси из {source_name}: {e}")
             return []
     
-    def _parse_proxies_lines(self, text: str) -> List[str]:
+    def _parse_proxies_lines(self, lines: Iterable[str]) -> List[str]:
         """
-        Парсинг прокси из текста (по одному на строку)
+        Парсинг прокси из потока строк (по одному на строку)
         
         Args:
-            text: Текст с прокси
+            lines: Строки с прокси, например response.iter_lines()
             
         Returns:
             Список валидных прокси
         """
         proxies = []
-        invalid_count = 0
-        
-        for line in text.strip().split('\n'):
+        for line in lines:
             line = line.strip()
-            if not line:
-                continue
-            
-            # Проверяем формат ip:port
-            if ':' in line and not any(c in line for c in [' ', '\t', '\r']):
-                parts = line.split(':')
-                if len(parts) == 2 and parts[0] and parts[1]:
-                    if self._validate_proxy(parts[0], parts[1]):
-                        proxies.append(line)
-                    else:
-                        invalid_count += 1
-                else:
-                    invalid_count += 1
-            else:
-                invalid_count += 1
+            if _PROXY_RE.fullmatch(line):
+                proxies.append(line)
         
-        logger.debug(f"Спарсено {len(proxies)} валидных прокси, невалидных: {invalid_count}")
+        logger.debug(f"Спарсено {len(proxies)} валидных прокси")
         return proxies
     
-    def _parse_proxies_json(self, text: str) -> List[str]:
+    def _parse_proxies_json(self, text: Union[str, bytes]) -> List[str]:
         """
         Парсинг прокси из JSON
         
         Args:
-            text: JSON текст с прокси
+            text: JSON текст с прокси (строка или байты ответа)
             
         Returns:
             Список валидных прокси
         """
         try:
-            data = json.loads(text)
+            data = orjson.loads(text) if orjson is not None else json.loads(text)
             proxies = []
             
             # Для proxy-list.download API
             if isinstance(data, dict) and 'LISTA' in data:
                 for proxy_str in data['LISTA']:
-                    if isinstance(proxy_str, str) and ':' in proxy_str:
-                        parts = proxy_str.split(':')
-                        if len(parts) == 2 and self._validate_proxy(parts[0], parts[1]):
-                            proxies.append(proxy_str)
+                    if isinstance(proxy_str, str) and _PROXY_RE.fullmatch(proxy_str):
+                        proxies.append(proxy_str)
             
             return proxies
         except Exception as e:
@@ -204,27 +361,13 @@ class ProxyManager:
         Returns:
             Список валидных прокси
         """
-        try:
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html, 'html.parser')
-            proxies = []
-            
-            # Ищем таблицы с прокси
-            tables = soup.find_all('table')
-            for table in tables:
-                rows = table.find_all('tr')
-                for row in rows[1:]:  # Пропускаем заголовок
-                    cols = row.find_all('td')
-                    if len(cols) >= 2:
-                        ip = cols[0].text.strip()
-                        port = cols[1].text.strip()
-                        if self._validate_proxy(ip, port):
-                            proxies.append(f"{ip}:{port}")
-            
-            return proxies
-        except Exception as e:
-            logger.warning(f"Ошибка парсинга HTML: {e}")
-            return []
+        # Ищем соседние ячейки <td>ip</td><td>port</td> регулярным выражением вместо DOM-дерева
+        proxies = [
+            f"{ip}:{port}" for ip, port in _HTML_CELLS_RE.findall(html)
+            if self._validate_proxy(ip, port)
+        ]
+        # Удаляем дубликаты, сохраняя порядок
+        return list(dict.fromkeys(proxies))
     
     def _validate_proxy(self, ip: str, port: str) -> bool:
         """
@@ -237,42 +380,37 @@ class ProxyManager:
         Returns:
             True если прокси валидна
         """
+        # IPv4Address проверяет октеты на C-уровне и отклоняет ведущие нули ("01.02.03.04")
         try:
-            # Проверяем IP
-            parts = ip.split('.')
-            if len(parts) != 4:
-                return False
-            for part in parts:
-                num = int(part)
-                if num < 0 or num > 255:
-                    return False
-            
-            # Проверяем порт
-            port_num = int(port)
-            if port_num < 1 or port_num > 65535:
-                return False
-            
-            return True
-        except:
+            ipaddress.IPv4Address(ip)
+        except ValueError:
             return False
+        # isdigit() пропускает '²' и цифры других алфавитов, которые int() не разбирает или принимает
+        return port.isascii() and port.isdigit() and 1 <= int(port) <= 65535
     
-    def _test_proxy(self, proxy: str) -> bool:
+    def _test_proxy(self, key: ProxyKey, session: Optional[requests.Session] = None) -> bool:
         """
         Проверка работоспособности прокси
         
         Args:
-            proxy: Адрес прокси в формате ip:port
+            key: Ключ прокси (ip, port)
+            session: Сессия для проверки; если не задана, создается временная
             
         Returns:
             True если прокси работает
         """
+        if session is None:
+            with requests.Session() as session:
+                return self._test_proxy(key, session)
+        
+        proxy = _proxy_str(key)
         try:
             proxies = {
                 'http': f'http://{proxy}',
                 'https': f'http://{proxy}'
             }
             
-            response = requests.get(
+            response = session.get(
                 self.test_url,
                 proxies=proxies,
                 timeout=self.test_timeout
@@ -289,7 +427,38 @@ class ProxyManager:
             logger.debug(f"Прокси {proxy} не работает: {e}")
             return False
     
-    def get_proxy(self) -> Optional[Dict[str, str]]:
+    def _test_all_proxies(self):
+        """Параллельная проверка всех прокси, остаются только рабочие"""
+        logger.info(f"Проверка {len(self.proxies)} прокси...")
+        # Отдельная короткоживущая сессия: адаптер кэширует пул соединений на каждый адрес прокси
+        # и не освобождает их сам, а cookies ответов не должны попадать в другие запросы.
+        # При закрытии сессии пулы всех проверенных прокси закрываются
+        with requests.Session() as session, ThreadPoolExecutor(max_workers=32) as executor:
+            test = functools.partial(self._test_proxy, session=session)
+            results = dict(zip(self.proxies, executor.map(test, self.proxies)))
+        
+        # Не прошедшие проверку запоминаются как неработающие, в том числе в кэше
+        now = time.time()
+        self.failed_proxies.update((p, now) for p in self.proxies if not results[p])
+        self.proxies = [p for p in self.proxies if results[p]]
+        logger.info(f"Рабочих прокси после проверки: {len(self.proxies)}")
+    
+    def _update_ranking(self):
+        """
+        Пересчет четверти самых быстрых рабочих прокси.
+        Пока время ответа измерено меньше чем у четверти прокси, выделенной группы нет:
+        иначе первые же измеренные прокси получали бы долю fastest_ratio всех запросов
+        """
+        measured = [key for key in self.healthy
+                    if key in self.proxy_stats and self.proxy_stats[key].response_count]
+        count = max(1, len(self.healthy) // 4)
+        if len(measured) < count:
+            self.fastest = []
+            return
+        self.fastest = heapq.nsmallest(count, measured,
+                                       key=lambda key: self.proxy_stats[key].avg_response_time)
+    
+    def get_proxy(self) -> Optional[Dict[str, Any]]:
         """
         Получение следующего прокси из ротации
         
@@ -311,48 +480,40 @@ class ProxyManager:
                 logger.warning("Не удалось получить прокси, работаем без прокси")
                 return None
         
-        # Ротация прокси
-        attempts = 0
-        max_attempts = len(self.proxies) * 2
+        # Если все прокси не работают, возвращаем None
+        if not self.healthy:
+            logger.warning("Все прокси не работают, работаем без прокси")
+            return None
+        
+        # Чаще отдаем самые быстрые прокси, остальные запросы идут по кругу,
+        # чтобы время ответа замерялось у всех прокси
+        if self.fastest and random.random() < self.fastest_ratio:
+            key = random.choice(self.fastest)
+        else:
+            key = self.healthy[0]
+            self.healthy.rotate(-1)
         
-        while attempts < max_attempts:
-            if self.current_index >= len(self.proxies):
-                self.current_index = 0
-            
-            proxy = self.proxies[self.current_index]
-            self.current_index += 1
-            attempts += 1
-            
-            # Пропускаем неработающие прокси
-            if proxy in self.failed_proxies:
-                continue
-            
-            # Инициализируем статистику прокси, если ее еще нет
-            if proxy not in self.proxy_stats:
-                self.proxy_stats[proxy] = {
-                    'requests': 0,
-                    'successful': 0,
-                    'failed': 0,
-                    'first_used': datetime.now().isoformat(),
-                    'last_used': None,
-                    'avg_response_time': 0
-                }
-            
-            # Обновляем статистику
-            self.proxy_stats[proxy]['requests'] += 1
-            self.proxy_stats[proxy]['last_used'] = datetime.now().isoformat()
-            self.total_requests += 1
-            
-            return {
-                'http': f'http://{proxy}',
-                'https': f'http://{proxy}'
-            }
+        now = time.time()
         
-        # Если все прокси не работают, возвращаем None
-        logger.warning("Все прокси не работают, работаем без прокси")
-        return None
+        # Инициализируем статистику прокси, если ее еще нет
+        stats = self.proxy_stats.get(key)
+        if stats is None:
+            stats = self.proxy_stats[key] = ProxyStat(first_used=now)
+        
+        # Обновляем статистику
+        stats.requests += 1
+        stats.last_used = now
+        self.total_requests += 1
+        
+        proxy_url = f'http://{key[0]}:{key[1]}'
+        # '_key' позволяет mark_success/mark_failed обойтись без разбора URL
+        return {
+            'http': proxy_url,
+            'https': proxy_url,
+            '_key': key
+        }
     
-    def mark_success(self, proxy_dict: Optional[Dict[str, str]], response_time: float = 0):
+    def mark_success(self, proxy_dict: Optional[Dict[str, Any]], response_time: float = 0):
         """
         Пометить прокси как успешно использованный
         
@@ -360,39 +521,76 @@ class ProxyManager:
             proxy_dict: Словарь с настройками прокси
             response_time: Время ответа в секундах
         """
-        if proxy_dict and 'http' in proxy_dict:
-            proxy_url = proxy_dict['http']
-            if proxy_url.startswith('http://'):
-                proxy = proxy_url.replace('http://', '')
-                if proxy in self.proxy_stats:
-                    self.proxy_stats[proxy]['successful'] += 1
-                    if response_time > 0:
-                        # Обновляем среднее время ответа
-                        stats = self.proxy_stats[proxy]
-                        total = stats['successful'] + stats['failed']
-                        stats['avg_response_time'] = (
-                            (stats['avg_response_time'] * (total - 1) + response_time) / total
-                        )
-                self.successful_requests += 1
-                logger.debug(f"Прокси {proxy} отмечен как успешный")
+        if proxy_dict and '_key' in proxy_dict:
+            key = proxy_dict['_key']
+            stats = self.proxy_stats.get(key)
+            if stats:
+                stats.successful += 1
+                if response_time > 0:
+                    # Инкрементальное среднее времени ответа
+                    stats.response_count += 1
+                    stats.avg_response_time += (
+                        (response_time - stats.avg_response_time) / stats.response_count
+                    )
+                    # Полный пересчет O(N) только если группа быстрых может измениться
+                    if self.fastest:
+                        slowest = self.proxy_stats[self.fastest[-1]].avg_response_time
+                        rerank = key in self.fastest or stats.avg_response_time < slowest
+                    else:
+                        # Группа может появиться, только когда измерен еще один прокси
+                        rerank = stats.response_count == 1
+                    if rerank:
+                        self._update_ranking()
+            self.successful_requests += 1
+            logger.debug(f"Прокси {key[0]}:{key[1]} отмечен как успешный")
     
-    def mark_failed(self, proxy_dict: Optional[Dict[str, str]]):
+    def mark_failed(self, proxy_dict: Optional[Dict[str, Any]]):
         """
         Пометить прокси как неработающий
         
         Args:
             proxy_dict: Словарь с настройками прокси
         """
-        if proxy_dict and 'http' in proxy_dict:
-            # Извлекаем адрес прокси из URL
-            proxy_url = proxy_dict['http']
-            if proxy_url.startswith('http://'):
-                proxy = proxy_url.replace('http://', '')
-                self.failed_proxies.add(proxy)
-                if proxy in self.proxy_stats:
-                    self.proxy_stats[proxy]['failed'] += 1
-                self.failed_requests += 1
-                logger.info(f"Прокси {proxy} помечен как неработающий")
+        if proxy_dict and '_key' in proxy_dict:
+            key = proxy_dict['_key']
+            self.failed_proxies[key] = time.time()
+            try:
+                self.healthy.remove(key)
+            except ValueError:
+                pass
+            if key in self.fastest:
+                self._update_ranking()
+            stats = self.proxy_stats.get(key)
+            if stats:
+                stats.failed += 1
+            self.failed_requests += 1
+            # Сразу на диск: после перезапуска забаненный прокси не должен вернуться в ротацию
+            self._save_cache()
+            logger.info(f"Прокси {key[0]}:{key[1]} помечен как неработающий")
+    
+    def mark_failed_batch(self, proxy_dicts: Iterable[Optional[Dict[str, Any]]]):
+        """
+        Пометить несколько прокси как неработающие за один проход
+        
+        Args:
+            proxy_dicts: Словари с настройками прокси (как из get_proxy)
+        """
+        keys = [p['_key'] for p in proxy_dicts if p and '_key' in p]
+        if not keys:
+            return
+        
+        self.failed_proxies.update(dict.fromkeys(keys, time.time()))
+        failed = set(keys)
+        self.healthy = deque(key for key in self.healthy if key not in failed)
+        if not failed.isdisjoint(self.fastest):
+            self._update_ranking()
+        for key in keys:
+            stats = self.proxy_stats.get(key)
+            if stats:
+                stats.failed += 1
+        self.failed_requests += len(keys)
+        self._save_cache()
+        logger.info(f"{len(keys)} прокси помечены как неработающие")
     
     def test_proxy(self, proxy: str) -> bool:
         """
@@ -404,28 +602,7 @@ class ProxyManager:
         Returns:
             True если прокси работает
         """
-        try:
-            proxies = {
-                'http': f'http://{proxy}',
-                'https': f'http://{proxy}'
-            }
-            
-            response = requests.get(
-                self.test_url,
-                proxies=proxies,
-                timeout=self.test_timeout
-            )
-            
-            if response.status_code == 200:
-                logger.debug(f"Прокси {proxy} работает")
-                return True
-            else:
-                logger.debug(f"Прокси {proxy} не отвечает (HTTP {response.status_code})")
-                return False
-                
-        except Exception as e:
-            logger.debug(f"Прокси {proxy} не работает: {e}")
-            return False
+        return self._test_proxy(_proxy_key(proxy))
     
     def get_stats(self) -> Dict:
         """
@@ -444,7 +621,7 @@ class ProxyManager:
             ),
             'proxies_count': len(self.proxies),
             'failed_proxies_count': len(self.failed_proxies),
-            'proxy_stats': self.proxy_stats,
+            'proxy_stats': {_proxy_str(key): data.as_dict() for key, data in self.proxy_stats.items()},
             'last_refresh': datetime.fromtimestamp(self.last_refresh).isoformat() if self.last_refresh else None
         }
     
@@ -479,9 +656,10 @@ class ProxyManager:
     
     def reset(self):
         """Сброс состояния менеджера прокси"""
-        self.current_index = 0
         self.failed_proxies.clear()
+        self.healthy = deque(self.proxies)
         self.proxy_stats.clear()
+        self.fastest = []
         self.total_requests = 0
         self.successful_requests = 0
         self.failed_requests = 0
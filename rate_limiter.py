@@ -27,19 +27,25 @@ class RateLimiter:
         if not self.enabled:
             return
         
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        # Монотонные часы не зависят от перевода системного времени
+        now = time.monotonic()
+        elapsed = now - self.last_request_time
+        
+        # Прошло больше максимальной задержки — ждать не нужно при любом случайном значении
+        if elapsed >= self.max_delay:
+            self.last_request_time = now
+            return
         
         # Вычисляем случайную задержку
         delay = random.uniform(self.min_delay, self.max_delay)
         
         # Если прошло меньше времени, чем нужно, ждем
-        if time_since_last < delay:
-            wait_time = delay - time_since_last
+        if elapsed < delay:
+            wait_time = delay - elapsed
             logger.debug(f"Ожидание {wait_time:.2f} секунд перед следующим запросом")
             time.sleep(wait_time)
         
-        self.last_request_time = time.time()
+        self.last_request_time = time.monotonic()
     
     def reset(self):
         """Сброс времени последнего запроса"""
@@ -4,6 +4,7 @@ import logging
 import random
 from typing import Optional, Dict, List
 from requests.cookies import RequestsCookieJar
+from requests.structures import CaseInsensitiveDict
 from config import Config
 
 logger = logging.getLogger(__name__)
@@ -57,6 +58,29 @@ class SessionManager:
         'DNT': '1',
     }
     
+    # Заголовки обычной сессии (без User-Agent), собираются один раз
+    SESSION_HEADERS = {
+        **BROWSER_HEADERS,
+        'Referer': 'https://www.linkedin.com/',
+        'Origin': 'https://www.linkedin.com',
+    }
+    
+    # Базовые заголовки сессии, привязанной к IP (без User-Agent и X-Forwarded-For)
+    IP_SESSION_HEADERS = {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Cache-Control': 'max-age=0',
+    }
+    
+    # Размер пакета заранее выбранных User-Agents (степень двойки)
+    UA_RING_SIZE = 64
+    
     def __init__(self, config: Config):
         """
         Инициализация SessionManager
@@ -66,13 +90,32 @@ class SessionManager:
         """
         self.config = config
         self.sessions: Dict[str, requests.Session] = {}
+        # ID сессий в виде списка для выбора случайной сессии без копирования ключей
+        self._session_ids: List[str] = []
         self.session_count = 0
         self.user_agents = config.get('user_agents', self.USER_AGENTS)
         self.max_sessions = config.get('session.max_sessions', 10)
         
+        # Заранее выбранные случайные User-Agents, расходуются по кругу
+        self._ua_ring = random.choices(self.user_agents, k=self.UA_RING_SIZE)
+        self._ua_idx = 0
+        
         # Инициализируем первую сессию
         self._create_session()
     
+    def _next_ua(self) -> str:
+        """
+        Следующий случайный User-Agent из заранее выбранного пакета
+        
+        Returns:
+            Строка User-Agent
+        """
+        ua = self._ua_ring[self._ua_idx]
+        self._ua_idx = (self._ua_idx + 1) & (self.UA_RING_SIZE - 1)
+        if self._ua_idx == 0:
+            self._ua_ring = random.choices(self.user_agents, k=self.UA_RING_SIZE)
+        return ua
+    
     def _create_session(self) -> str:
         """
         Создание новой сессии с реалистичными браузерными заголовками
@@ -85,23 +128,15 @@ class SessionManager:
         
         session = requests.Session()
         
-        # Устанавливаем случайный User-Agent
-        user_agent = random.choice(self.user_agents)
-        
-        # Копируем браузерные заголовки и добавляем User-Agent
-        headers = self.BROWSER_HEADERS.copy()
-        headers['User-Agent'] = user_agent
-        
-        # Добавляем заголовки для LinkedIn специфично
-        headers['Referer'] = 'https://www.linkedin.com/'
-        headers['Origin'] = 'https://www.linkedin.com'
-        
-        session.headers.update(headers)
+        # Устанавливаем готовые браузерные заголовки со случайным User-Agent
+        user_agent = self._next_ua()
+        session.headers = CaseInsensitiveDict({**self.SESSION_HEADERS, 'User-Agent': user_agent})
         
         # Увеличиваем timeout для долгих запросов
         session.timeout = 30
         
         self.sessions[session_id] = session
+        self._session_ids.append(session_id)
         logger.info(f"Создана новая сессия {session_id} с User-Agent: {user_agent}")
         
         return session_id
@@ -119,16 +154,10 @@ class SessionManager:
             if random.random() < 0.3:
                 self._create_session()
         
-        # Выбираем случайную сессию
-        session_id = random.choice(list(self.sessions.keys()))
-        session = self.sessions[session_id]
-        
-        # Время от времени обновляем User-Agent в сессии
-        if random.random() < 0.2:  # 20% вероятность
-            session.headers['User-Agent'] = random.choice(self.user_agents)
-            logger.debug(f"Обновлен User-Agent в {session_id}: {session.headers['User-Agent']}")
-        
-        return session
+        # Выбираем случайную сессию: у каждой свой постоянный User-Agent,
+        # поэтому ротация User-Agent происходит через выбор сессии
+        session_id = random.choice(self._session_ids)
+        return self.sessions[session_id]
     
     def get_session_with_id(self, session_id: str) -> Optional[requests.Session]:
         """
@@ -151,12 +180,12 @@ class SessionManager:
         """
         if session_id:
             if session_id in self.sessions:
-                self.sessions[session_id].headers['User-Agent'] = random.choice(self.user_agents)
+                self.sessions[session_id].headers['User-Agent'] = self._next_ua()
                 logger.debug(f"Обновлен User-Agent в {session_id}")
         else:
             # Обновляем User-Agent во всех сессиях
             for sid, session in self.sessions.items():
-                session.headers['User-Agent'] = random.choice(self.user_agents)
+                session.headers['User-Agent'] = self._next_ua()
             logger.debug("Обновлены User-Agents во всех сессиях")
     
     def clear_cookies(self, session_id: Optional[str] = None):
@@ -178,18 +207,12 @@ class SessionManager:
     
     def rotate_session(self) -> requests.Session:
         """
-        Получить сессию и ротировать User-Agent
+        Получить случайную сессию из ротации
         
         Returns:
-            Объект сессии с ротированным User-Agent
+            Объект сессии со своим постоянным User-Agent
         """
-        session = self.get_session()
-        
-        # Периодически обновляем User-Agent
-        if random.random() < 0.15:  # 15% вероятность
-            self.rotate_user_agent()
-        
-        return session
+        return self.get_session()
     
     def create_new_session_for_ip(self, ip: str) -> requests.Session:
         """
@@ -206,26 +229,15 @@ class SessionManager:
         
         session = requests.Session()
         
-        # Устанавливаем случайный User-Agent
-        session.headers.update({
-            'User-Agent': random.choice(self.user_agents)
-        })
-        
-        # Базовые заголовки
-        session.headers.update({
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Cache-Control': 'max-age=0',
-            'X-Forwarded-For': ip,  # Добавляем заголовок для маскировки IP
+        # Базовые заголовки со случайным User-Agent и заголовком для маскировки IP
+        session.headers = CaseInsensitiveDict({
+            **self.IP_SESSION_HEADERS,
+            'User-Agent': self._next_ua(),
+            'X-Forwarded-For': ip,
         })
         
         self.sessions[session_id] = session
+        self._session_ids.append(session_id)
         logger.info(f"Создана сессия {session_id} для IP {ip}")
         
         return session
@@ -255,6 +267,7 @@ class SessionManager:
         """Очистить все сессии и создать новую"""
         logger.info(f"Очищено {len(self.sessions)} сессий")
         self.sessions.clear()
+        self._session_ids.clear()
         self._create_session()
     
     def remove_session(self, session_id: str):
@@ -266,4 +279,5 @@ class SessionManager:
         """
         if session_id in self.sessions:
             del self.sessions[session_id]
+            self._session_ids.remove(session_id)
             logger.info(f"Удалена сессия {session_id}")
@@ -0,0 +1,52 @@
+"""Тесты разбора HTML профиля LinkedIn (без сетевых запросов)"""
+import pytest
+from bs4 import BeautifulSoup
+from linkedin_parser import LinkedInParser, _text
+from proxy_manager import ProxyManager
+from rate_limiter import RateLimiter
+from session_manager import SessionManager
+
+
+@pytest.fixture
+def parser(offline_config) -> LinkedInParser:
+    """Парсер без прокси и задержек"""
+    return LinkedInParser(
+        offline_config,
+        ProxyManager(offline_config),
+        RateLimiter(enabled=False),
+        SessionManager(offline_config)
+    )
+
+
+def test_select_keeps_priority_order(parser):
+    """Порядок селекторов не зависит от ранее разобранных страниц"""
+    div_page = BeautifulSoup(
+        '<div class="projects"><div class="project-item">A</div></div>', 'html.parser'
+    )
+    li_page = BeautifulSoup(
+        '<section id="projects"><ul>'
+        '<li class="project"><div class="project-desc">B</div></li>'
+        '</ul></section>', 'html.parser'
+    )
+    
+    div_items = parser._select(parser._select(div_page, 'projects'), 'projects_items', find_all=True)
+    assert [item.name for item in div_items] == ['div']
+    
+    li_section = parser._select(li_page, 'projects')
+    assert li_section.name == 'section'
+    li_items = parser._select(li_section, 'projects_items', find_all=True)
+    assert [item.name for item in li_items] == ['li']
+
+
+@pytest.mark.parametrize('html', [
+    '<span>  Software Engineer  </span>',
+    '<span><a> Acme </a></span>',
+    '<div><span>Jan 2020</span> – <span>Mar 2022</span></div>',
+    '<span><!-- скрыто --></span>',
+    '<span>Moscow<!-- note --></span>',
+    '<span></span>',
+])
+def test_text_matches_get_text(html):
+    """_text совпадает с get_text(strip=True) для листовых, вложенных и служебных узлов"""
+    elem = BeautifulSoup(html, 'html.parser').find(True)
+    assert _text(elem) == elem.get_text(strip=True)
@@ -0,0 +1,238 @@
+"""Тесты ProxyManager без сетевых запросов (proxy.enabled=False)"""
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from proxy_manager import ProxyManager, ProxyStat
+
+
+@pytest.fixture
+def manager(offline_config) -> ProxyManager:
+    """ProxyManager без загрузки прокси и без файлового кэша"""
+    return ProxyManager(offline_config)
+
+
+def test_parse_lines_rejects_non_ascii_digits(manager):
+    """Цифры Unicode (арабские, верхние индексы) не принимаются за IP и порт"""
+    lines = ['1.2.3.4:8080', '١.٢.٣.٤:80', '5.6.7.8:٨٠', '9.9.9.9:²']
+    assert manager._parse_proxies_lines(lines) == ['1.2.3.4:8080']
+
+
+def test_parse_html_rejects_non_ascii_digits(manager):
+    """В HTML таблице учитываются только ASCII цифры"""
+    html = ('<tr><td>1.2.3.4</td><td>80</td></tr>'
+            '<tr><td>١.٢.٣.٤</td><td>80</td></tr>')
+    assert manager._parse_proxies_html(html) == ['1.2.3.4:80']
+
+
+def test_parse_lines(manager):
+    """Строки обрезаются по краям, строки не в формате ip:port отбрасываются"""
+    lines = [' 1.2.3.4:8080 ', '', 'not a proxy', '256.1.1.1:80', '5.6.7.8:3128\r']
+    assert manager._parse_proxies_lines(lines) == ['1.2.3.4:8080', '5.6.7.8:3128']
+
+
+@pytest.mark.parametrize('text', [
+    '{"LISTA": ["1.2.3.4:8080", 42, "bad", "5.6.7.8:80"]}',
+    b'{"LISTA": ["1.2.3.4:8080", 42, "bad", "5.6.7.8:80"]}',
+])
+def test_parse_json(manager, text):
+    """Из списка LISTA берутся только строки в формате ip:port (ответ - строка или байты)"""
+    assert manager._parse_proxies_json(text) == ['1.2.3.4:8080', '5.6.7.8:80']
+
+
+@pytest.mark.parametrize('text', ['{"data": ["1.2.3.4:80"]}', 'not json'])
+def test_parse_json_without_list(manager, text):
+    """Неизвестный формат и битый JSON дают пустой список"""
+    assert manager._parse_proxies_json(text) == []
+
+
+def test_parse_html(manager):
+    """Ячейки таблицы с IP и портом: невалидные отбрасываются, дубликаты удаляются с сохранением порядка"""
+    html = (
+        '<table>'
+        '<tr><td class="ip"> 5.6.7.8 </td>\n<td>3128</td><td>no</td></tr>'
+        '<TR><TD>1.2.3.4</TD><TD>80</TD></TR>'
+        '<tr><td>5.6.7.8</td><td>3128</td></tr>'
+        '<tr><td>01.2.3.4</td><td>80</td></tr>'
+        '<tr><td>9.9.9.9</td><td>70000</td></tr>'
+        '</table>'
+    )
+    assert manager._parse_proxies_html(html) == ['5.6.7.8:3128', '1.2.3.4:80']
+
+
+def test_cache_round_trip(offline_config, tmp_path):
+    """Список прокси и неработающие прокси переживают перезапуск через файловый кэш"""
+    cache_file = tmp_path / 'proxy_cache.json'
+    offline_config.config['proxy']['cache_file'] = str(cache_file)
+    
+    manager = ProxyManager(offline_config)
+    manager.proxies = [('1.1.1.1', 80), ('2.2.2.2', 8080)]
+    manager.failed_proxies = {('3.3.3.3', 3128): time.time()}
+    manager.last_refresh = time.time()
+    manager._save_cache()
+    
+    restored = ProxyManager(offline_config)
+    assert restored._load_cache()
+    assert restored.proxies == [('1.1.1.1', 80), ('2.2.2.2', 8080)]
+    assert list(restored.healthy) == restored.proxies
+    assert ('3.3.3.3', 3128) in restored.failed_proxies
+
+
+def test_failed_proxies_expire_individually(offline_config, tmp_path):
+    """Срок хранения отсчитывается от отказа каждого прокси, а не от последней записи кэша"""
+    cache_file = tmp_path / 'proxy_cache.json'
+    offline_config.config['proxy']['cache_file'] = str(cache_file)
+    now = time.time()
+    
+    manager = ProxyManager(offline_config)
+    manager.proxies = [('1.1.1.1', 80)]
+    manager.failed_proxies = {
+        ('2.2.2.2', 80): now - manager.failed_ttl - 1,
+        ('3.3.3.3', 80): now - 1,
+    }
+    manager.last_refresh = now
+    manager._save_cache()
+    
+    restored = ProxyManager(offline_config)
+    restored._load_cache()
+    assert set(restored.failed_proxies) == {('3.3.3.3', 80)}
+
+
+def test_untested_proxies_are_remembered_as_failed(manager):
+    """Прокси, не прошедшие проверку при обновлении, попадают в failed_proxies"""
+    manager.proxies = [('1.1.1.1', 80), ('2.2.2.2', 80)]
+    with patch.object(manager, '_test_proxy', side_effect=lambda key, session=None: key == ('1.1.1.1', 80)):
+        manager._test_all_proxies()
+    assert manager.proxies == [('1.1.1.1', 80)]
+    assert ('2.2.2.2', 80) in manager.failed_proxies
+
+
+def test_fast_tier_waits_for_enough_measurements(manager):
+    """Группа быстрых прокси появляется, только когда измерена хотя бы четверть рабочих прокси"""
+    manager.healthy.extend(('10.0.0.%d' % i, 80) for i in range(8))
+    for key in manager.healthy:
+        manager.proxy_stats[key] = ProxyStat()
+    
+    first, second, *_ = manager.healthy
+    manager.mark_success({'_key': first}, response_time=0.5)
+    assert manager.fastest == []
+    
+    manager.mark_success({'_key': second}, response_time=0.2)
+    assert manager.fastest == [second, first]
+
+
+@pytest.mark.parametrize('port, valid', [
+    ('8080', True),
+    ('0', False),
+    ('65536', False),
+    ('²', False),
+    ('٨٠', False),
+])
+def test_validate_proxy_port(manager, port, valid):
+    """Порт принимается только из ASCII-цифр в диапазоне 1-65535"""
+    assert manager._validate_proxy('1.2.3.4', port) is valid
+
+
+
+def test_proxy_checks_do_not_pool_connections(manager):
+    """Проверки прокси не оставляют пулов соединений в общей сессии и закрывают свои"""
+    manager.proxies = [('10.0.0.%d' % i, 80) for i in range(20)]
+    adapters = []
+    
+    def send(adapter, request, **kwargs):
+        # Вместо сетевого запроса только создаем пул для прокси, как это делает HTTPAdapter
+        adapter.proxy_manager_for(kwargs['proxies']['https']).connection_from_url(request.url)
+        adapters.append(adapter)
+        response = requests.Response()
+        response.status_code = 200
+        return response
+    
+    with patch.object(HTTPAdapter, 'send', send):
+        manager._test_all_proxies()
+        manager._test_all_proxies()
+    
+    assert len(manager.proxies) == 20
+    assert all(not adapter.proxy_manager for adapter in manager._source_session.adapters.values())
+    assert all(not pool.pools for adapter in adapters for pool in adapter.proxy_manager.values())
+
+@pytest.fixture
+def filled_manager(manager) -> ProxyManager:
+    """ProxyManager с заполненным вручную списком прокси, без обновления из источников"""
+    manager.proxy_enabled = True
+    manager.last_refresh = time.time()
+    manager.proxies = [('10.0.0.%d' % i, 80) for i in range(8)]
+    manager.healthy.extend(manager.proxies)
+    return manager
+
+
+def test_get_proxy_rotates(filled_manager):
+    """Пока нет группы быстрых прокси, прокси выдаются по кругу"""
+    keys = [filled_manager.get_proxy()['_key'] for _ in range(10)]
+    assert keys == filled_manager.proxies + filled_manager.proxies[:2]
+    proxy = filled_manager.get_proxy()
+    assert proxy['http'] == proxy['https'] == 'http://10.0.0.2:80'
+    assert filled_manager.total_requests == 11
+
+
+def test_mark_failed_batch(filled_manager):
+    """Пакетная отметка убирает прокси из ротации и из группы быстрых, None пропускается"""
+    manager = filled_manager
+    proxies = [manager.get_proxy() for _ in range(4)]
+    for proxy, response_time in zip(proxies, (0.4, 0.3, 0.2, 0.1)):
+        manager.mark_success(proxy, response_time=response_time)
+    assert set(manager.fastest) == {proxies[3]['_key'], proxies[2]['_key']}
+    
+    manager.mark_failed_batch([proxies[3], None, proxies[0]])
+    
+    failed = {proxies[3]['_key'], proxies[0]['_key']}
+    assert set(manager.failed_proxies) == failed
+    assert failed.isdisjoint(manager.healthy)
+    assert len(manager.healthy) == 6
+    assert failed.isdisjoint(manager.fastest)
+    assert manager.fastest
+    assert manager.proxy_stats[proxies[3]['_key']].failed == 1
+    assert manager.failed_requests == 2
+
+
+def test_runtime_failures_survive_restart(offline_config, tmp_path):
+    """Прокси, отказавшие во время работы, после перезапуска не возвращаются в ротацию"""
+    offline_config.config['proxy']['cache_file'] = str(tmp_path / 'proxy_cache.json')
+    
+    manager = ProxyManager(offline_config)
+    manager.proxies = [('1.1.1.1', 80), ('2.2.2.2', 80), ('3.3.3.3', 80)]
+    manager.healthy.extend(manager.proxies)
+    manager.last_refresh = time.time()
+    manager._save_cache()
+    
+    manager.mark_failed({'_key': ('1.1.1.1', 80)})
+    manager.mark_failed_batch([{'_key': ('2.2.2.2', 80)}])
+    
+    restored = ProxyManager(offline_config)
+    assert restored._load_cache()
+    assert list(restored.healthy) == [('3.3.3.3', 80)]
+    assert set(restored.failed_proxies) == {('1.1.1.1', 80), ('2.2.2.2', 80)}
+    assert [p.name for p in tmp_path.iterdir()] == ['proxy_cache.json']
+
+
+def test_mark_success_reranks_only_when_tier_can_change(filled_manager):
+    """Успех медленного прокси вне группы быстрых не вызывает пересчет рейтинга"""
+    manager = filled_manager
+    proxies = [manager.get_proxy() for _ in range(4)]
+    for proxy, response_time in zip(proxies, (0.4, 0.3, 0.2, 0.1)):
+        manager.mark_success(proxy, response_time=response_time)
+    assert manager.fastest == [proxies[3]['_key'], proxies[2]['_key']]
+    
+    with patch.object(manager, '_update_ranking', wraps=manager._update_ranking) as update:
+        manager.mark_success(proxies[0], response_time=0.5)
+        assert update.call_count == 0
+        
+        manager.mark_success(proxies[1], response_time=0.05)
+        assert update.call_count == 1
+        assert manager.fastest == [proxies[3]['_key'], proxies[1]['_key']]
+        
+        manager.mark_success(proxies[3], response_time=0.9)
+        assert update.call_count == 2
+        assert manager.fastest == [proxies[1]['_key'], proxies[2]['_key']]
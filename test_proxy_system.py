@@ -1,211 +1,263 @@
 #!/usr/bin/env python3
-"""Скрипт для проверки работоспособности системы прокси и сессий"""
+"""Скрипт для проверки работоспособности системы прокси и сессий
+
+Запуск: python test_proxy_system.py или pytest test_proxy_system.py
+(с pytest-xdist тесты распределяются по ядрам: pytest -n auto test_proxy_system.py).
+Без сети: pytest -m "not network" (тесты, загружающие и проверяющие прокси, пропускаются).
+Фикстуры config, proxy_manager и session_manager определены в conftest.py.
+"""
 
 import sys
 import logging
-from config import Config
-from proxy_manager import ProxyManager
+import logging.handlers
+import functools
+from itertools import islice
+from unittest.mock import patch
+
+import pytest
+
 from rate_limiter import RateLimiter
-from session_manager import SessionManager
 
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+logger = logging.getLogger(__name__)
+
+# Символы рамки: псевдографика только для UTF-8 терминала, иначе ASCII
+_BOX = (
+    ('╔', '═', '╗', '║', '╚', '╝')
+    if sys.stderr.isatty() and 'utf' in (sys.stderr.encoding or '').lower()
+    else ('+', '-', '+', '|', '+', '+')
 )
 
-logger = logging.getLogger(__name__)
+# Разделители и рамка заголовка
+_DIV = "=" * 60
+_NL_DIV = "\n" + _DIV
+_TOP = _BOX[0] + _BOX[1] * 58 + _BOX[2]
+_MID = "".join((_BOX[3], " " * 10, "ТЕСТИРОВАНИЕ СИСТЕМЫ ПРОКСИ И СЕССИЙ", " " * 12, _BOX[3]))
+_BOT = _BOX[4] + _BOX[1] * 58 + _BOX[5]
+
+
+def _configure_logging() -> logging.handlers.MemoryHandler:
+    """
+    Настройка логирования для запуска скриптом.
+    Записи копятся в MemoryHandler и выводятся пачкой: при заполнении буфера,
+    на ошибке или при явном flush()
+    
+    Returns:
+        Буферизующий обработчик
+    """
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    ))
+    memory_handler = logging.handlers.MemoryHandler(
+        capacity=1024,
+        flushLevel=logging.ERROR,
+        target=stream_handler
+    )
+    logging.getLogger().addHandler(memory_handler)
+    logging.getLogger().setLevel(logging.INFO)
+    return memory_handler
+
+
+@functools.lru_cache(maxsize=64)
+def _trunc50(text: str) -> str:
+    """Первые 50 символов строки; User-Agents повторяются, поэтому результат кэшируется"""
+    return text[:50]
+
+
+class _FakeClock:
+    """Подменные часы для RateLimiter: sleep мгновенно сдвигает monotonic"""
+    
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+        self.sleeps = []
+    
+    def monotonic(self) -> float:
+        return self.now
+    
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
 
-def test_proxy_manager():
+
+@pytest.mark.network
+def test_proxy_manager(proxy_manager):
     """Тест ProxyManager"""
-    logger.info("=" * 60)
+    logger.info(_DIV)
     logger.info("ТЕСТИРОВАНИЕ PROXY MANAGER")
-    logger.info("=" * 60)
+    logger.info(_DIV)
     
-    try:
-        config = Config()
-        proxy_manager = ProxyManager(config)
-        
-        # Проверка получения прокси
-        logger.info("\n1. Получение прокси из ротации...")
-        for i in range(5):
-            proxy = proxy_manager.get_proxy()
-            logger.info(f"   Попытка {i+1}: {proxy}")
-        
-        # Проверка отметки успеха
-        logger.info("\n2. Отметка успешного использования прокси...")
+    info_on = logger.isEnabledFor(logging.INFO)
+    
+    # Проверка получения прокси (None допустим, если источники недоступны)
+    logger.info("\n1. Получение прокси из ротации...")
+    for i in range(5):
         proxy = proxy_manager.get_proxy()
-        if proxy:
-            proxy_manager.mark_success(proxy, response_time=0.75)
-            logger.info(f"   ✓ Отмечен прокси {proxy['http']}")
-        
-        # Проверка отметки ошибки
-        logger.info("\n3. Отметка неработающего прокси...")
-        if proxy:
-            proxy_manager.mark_failed(proxy)
-            logger.info(f"   ✓ Помечен прокси {proxy['http']} как неработающий")
-        
-        # Проверка статистики
+        assert proxy is None or proxy['http'] == proxy['https']
+        if info_on:
+            logger.info("   Попытка %d: %s", i + 1, proxy)
+    
+    # Проверка отметки успеха
+    logger.info("\n2. Отметка успешного использования прокси...")
+    proxy = proxy_manager.get_proxy()
+    if proxy:
+        proxy_manager.mark_success(proxy, response_time=0.75)
+        assert proxy_manager.proxy_stats[proxy['_key']].successful >= 1
+        logger.info("   ✓ Отмечен прокси %s", proxy['http'])
+    
+    # Проверка отметки ошибки
+    logger.info("\n3. Отметка неработающего прокси...")
+    if proxy:
+        proxy_manager.mark_failed(proxy)
+        assert proxy['_key'] in proxy_manager.failed_proxies
+        assert proxy['_key'] not in proxy_manager.healthy
+        logger.info("   ✓ Помечен прокси %s как неработающий", proxy['http'])
+    
+    # Проверка статистики
+    # print_stats только выводит в лог, при отключенном INFO он не нужен
+    if info_on:
         logger.info("\n4. Статистика ProxyManager:")
         proxy_manager.print_stats()
-        
-        logger.info("\n✓ ProxyManager работает корректно!")
-        return True
-        
-    except Exception as e:
-        logger.error(f"✗ Ошибка в ProxyManager: {e}", exc_info=True)
-        return False
-
-def test_session_manager():
+    
+    logger.info("\n✓ ProxyManager работает корректно!")
+
+
+def test_session_manager(session_manager):
     """Тест SessionManager"""
-    logger.info("\n" + "=" * 60)
+    logger.info(_NL_DIV)
     logger.info("ТЕСТИРОВАНИЕ SESSION MANAGER")
-    logger.info("=" * 60)
+    logger.info(_DIV)
     
-    try:
-        config = Config()
-        session_manager = SessionManager(config)
-        
-        # Проверка получения сессии
-        logger.info("\n1. Получение сессий...")
-        for i in range(3):
-            session = session_manager.rotate_session()
-            user_agent = session.headers.get('User-Agent', 'Unknown')[:50]
-            logger.info(f"   Сессия {i+1}: User-Agent={user_agent}...")
-        
-        # Проверка получения сессии по ID
-        logger.info("\n2. Получение сессии по ID...")
-        session_0 = session_manager.get_session_with_id('session_0')
-        if session_0:
-            logger.info(f"   ✓ Сессия session_0 найдена")
-        else:
-            logger.warning(f"   ✗ Сессия session_0 не найдена")
-        
-        # Проверка ротации User-Agent
-        logger.info("\n3. Ротация User-Agent во всех сессиях...")
-        session_manager.rotate_user_agent()
-        logger.info(f"   ✓ User-Agents обновлены")
-        
-        # Проверка очистки cookies
-        logger.info("\n4. Очистка cookies...")
-        session_manager.clear_cookies()
-        logger.info(f"   ✓ Cookies очищены")
-        
-        # Проверка создания новой сессии для IP
-        logger.info("\n5. Создание сессии для конкретного IP...")
-        session = session_manager.create_new_session_for_ip('192.168.1.1')
-        if session:
-            logger.info(f"   ✓ Сессия создана для IP 192.168.1.1")
-        
-        # Проверка статистики
-        logger.info("\n6. Статистика SessionManager:")
-        stats = session_manager.get_stats()
-        logger.info(f"   Всего сессий: {stats['total_sessions']}")
-        for session_id, data in list(stats['sessions'].items())[:3]:
-            logger.info(f"   {session_id}: cookies={data['cookies_count']}")
-        
-        logger.info("\n✓ SessionManager работает корректно!")
-        return True
-        
-    except Exception as e:
-        logger.error(f"✗ Ошибка в SessionManager: {e}", exc_info=True)
-        return False
-
-def test_rate_limiter():
+    info_on = logger.isEnabledFor(logging.INFO)
+    
+    # Проверка получения сессии
+    logger.info("\n1. Получение сессий...")
+    for i in range(3):
+        session = session_manager.rotate_session()
+        assert session.headers.get('User-Agent')
+        if info_on:
+            user_agent = _trunc50(session.headers.get('User-Agent', 'Unknown'))
+            logger.info("   Сессия %d: User-Agent=%s...", i + 1, user_agent)
+    
+    # Проверка получения сессии по ID
+    logger.info("\n2. Получение сессии по ID...")
+    session_0 = session_manager.get_session_with_id('session_0')
+    assert session_0 is not None, "Сессия session_0 не найдена"
+    logger.info("   ✓ Сессия session_0 найдена")
+    
+    # Проверка ротации User-Agent
+    logger.info("\n3. Ротация User-Agent во всех сессиях...")
+    session_manager.rotate_user_agent()
+    logger.info("   ✓ User-Agents обновлены")
+    
+    # Проверка очистки cookies
+    logger.info("\n4. Очистка cookies...")
+    session_manager.clear_cookies()
+    assert all(len(s.cookies) == 0 for s in session_manager.sessions.values())
+    logger.info("   ✓ Cookies очищены")
+    
+    # Проверка создания новой сессии для IP
+    logger.info("\n5. Создание сессии для конкретного IP...")
+    session = session_manager.create_new_session_for_ip('192.168.1.1')
+    assert session.headers['X-Forwarded-For'] == '192.168.1.1'
+    logger.info("   ✓ Сессия создана для IP 192.168.1.1")
+    
+    # Проверка статистики
+    logger.info("\n6. Статистика SessionManager:")
+    stats = session_manager.get_stats()
+    assert stats['total_sessions'] == len(session_manager.sessions)
+    if info_on:
+        logger.info("   Всего сессий: %s", stats['total_sessions'])
+        for session_id, data in islice(stats['sessions'].items(), 3):
+            logger.info("   %s: cookies=%s", session_id, data['cookies_count'])
+    
+    logger.info("\n✓ SessionManager работает корректно!")
+
+
+def test_rate_limiter(config):
     """Тест RateLimiter"""
-    logger.info("\n" + "=" * 60)
+    logger.info(_NL_DIV)
     logger.info("ТЕСТИРОВАНИЕ RATE LIMITER")
-    logger.info("=" * 60)
+    logger.info(_DIV)
     
-    try:
-        config = Config()
-        rate_limiter = RateLimiter(
-            min_delay=config.get('rate_limiting.min_delay', 2),
-            max_delay=config.get('rate_limiting.max_delay', 5),
-            enabled=True
-        )
-        
-        logger.info("\n1. Проверка rate limiting...")
-        logger.info("   Отправка 3 запросов с задержками...")
-        
-        import time
+    rate_limiter = RateLimiter(
+        min_delay=config.get('rate_limiting.min_delay', 2),
+        max_delay=config.get('rate_limiting.max_delay', 5),
+        enabled=True
+    )
+    
+    logger.info("\n1. Проверка rate limiting...")
+    logger.info("   Отправка 3 запросов с задержками (подменные часы, без реального ожидания)...")
+    
+    clock = _FakeClock()
+    with patch('rate_limiter.time', clock):
         for i in range(3):
-            start = time.time()
+            start = clock.monotonic()
             rate_limiter.wait()
-            elapsed = time.time() - start
-            logger.info(f"   Запрос {i+1}: задержка {elapsed:.2f}s")
-        
-        logger.info("\n✓ RateLimiter работает корректно!")
-        return True
-        
-    except Exception as e:
-        logger.error(f"✗ Ошибка в RateLimiter: {e}", exc_info=True)
-        return False
-
-def test_config():
+            logger.info("   Запрос %d: задержка %.2fs", i + 1, clock.monotonic() - start)
+    
+    # Первый запрос проходит сразу, перед каждым следующим — задержка в заданном диапазоне
+    assert len(clock.sleeps) == 2, f"ожидалось 2 задержки, получено {len(clock.sleeps)}"
+    for delay in clock.sleeps:
+        assert rate_limiter.min_delay <= delay <= rate_limiter.max_delay, f"задержка {delay:.2f}s вне диапазона"
+    
+    logger.info("\n✓ RateLimiter работает корректно!")
+
+
+def test_config(config):
     """Тест Config"""
-    logger.info("\n" + "=" * 60)
+    logger.info(_NL_DIV)
     logger.info("ТЕСТИРОВАНИЕ CONFIG")
-    logger.info("=" * 60)
+    logger.info(_DIV)
     
-    try:
-        config = Config()
-        
-        logger.info("\n1. Проверка параметров конфигурации...")
-        
-        # Проверка основных параметров
-        proxy_enabled = config.get('proxy.enabled', True)
-        logger.info(f"   proxy.enabled: {proxy_enabled}")
-        
-        max_proxies = config.get('proxy.max_proxies', 50)
-        logger.info(f"   proxy.max_proxies: {max_proxies}")
-        
-        min_delay = config.get('rate_limiting.min_delay', 2)
-        logger.info(f"   rate_limiting.min_delay: {min_delay}")
-        
-        max_sessions = config.get('session.max_sessions', 10)
-        logger.info(f"   session.max_sessions: {max_sessions}")
-        
-        user_agents_count = len(config.get('user_agents', []))
-        logger.info(f"   user_agents count: {user_agents_count}")
-        
-        logger.info("\n✓ Config работает корректно!")
-        return True
-        
-    except Exception as e:
-        logger.error(f"✗ Ошибка в Config: {e}", exc_info=True)
-        return False
+    logger.info("\n1. Проверка параметров конфигурации...")
+    
+    # Проверка основных параметров: секции берутся из словаря конфигурации один раз,
+    # без разбора ключа с точками на каждый параметр
+    data = config.config
+    proxy_config = data.get('proxy', {})
+    
+    proxy_enabled = proxy_config.get('enabled', True)
+    logger.info("   proxy.enabled: %s", proxy_enabled)
+    
+    max_proxies = proxy_config.get('max_proxies', 50)
+    assert max_proxies > 0
+    logger.info("   proxy.max_proxies: %s", max_proxies)
+    
+    min_delay = data.get('rate_limiting', {}).get('min_delay', 2)
+    assert min_delay >= 0
+    logger.info("   rate_limiting.min_delay: %s", min_delay)
+    
+    max_sessions = data.get('session', {}).get('max_sessions', 10)
+    assert max_sessions > 0
+    logger.info("   session.max_sessions: %s", max_sessions)
+    
+    user_agents_count = len(data.get('user_agents', []))
+    assert user_agents_count > 0
+    logger.info("   user_agents count: %s", user_agents_count)
+    
+    logger.info("\n✓ Config работает корректно!")
+
 
 def main():
-    """Главная функция тестирования"""
+    """Главная функция тестирования: тесты запускаются через pytest"""
     logger.info("\n")
-    logger.info("╔" + "═" * 58 + "╗")
-    logger.info("║" + " " * 10 + "ТЕСТИРОВАНИЕ СИСТЕМЫ ПРОКСИ И СЕССИЙ" + " " * 12 + "║")
-    logger.info("╚" + "═" * 58 + "╝")
-    
-    results = {
-        'Config': test_config(),
-        'RateLimiter': test_rate_limiter(),
-        'ProxyManager': test_proxy_manager(),
-        'SessionManager': test_session_manager(),
-    }
-    
-    logger.info("\n" + "=" * 60)
-    logger.info("ИТОГОВЫЕ РЕЗУЛЬТАТЫ")
-    logger.info("=" * 60)
-    
-    for name, result in results.items():
-        status = "✓ ПРОЙДЕН" if result else "✗ ПРОВАЛЕН"
-        logger.info(f"{name}: {status}")
-    
-    logger.info("=" * 60)
-    
-    if all(results.values()):
-        logger.info("\n✓ ВСЕ ТЕСТЫ ПРОЙДЕНЫ УСПЕШНО!")
-        return 0
-    else:
-        logger.error("\n✗ НЕКОТОРЫЕ ТЕСТЫ НЕ ПРОЙДЕНЫ!")
-        return 1
+    logger.info(_TOP)
+    logger.info(_MID)
+    logger.info(_BOT)
+    
+    # Итоги выводит pytest; при ошибке фикстуры config зависящие от нее тесты не выполняются.
+    # --capture=sys: буфер логов может сброситься посреди теста (на ошибке), и при перехвате
+    # на уровне файловых дескрипторов эти записи не дошли бы до терминала.
+    # Аргументы командной строки передаются pytest (например, -n auto для pytest-xdist)
+    return int(pytest.main([__file__, '--capture=sys', *sys.argv[1:]]))
+
 
 if __name__ == '__main__':
-    sys.exit(main())
+    # Логирование настраивается только при запуске скриптом: импорт модуля
+    # (pytest, другие сценарии) не меняет глобальные настройки logging
+    memory_handler = _configure_logging()
+    try:
+        exit_code = main()
+    finally:
+        memory_handler.flush()
+    sys.exit(exit_code)